@@ -1,44 +1,68 @@
+from functools import partial
+
+from ir_generator import COMPARISON_OPERATORS
+
 class CodeGenerator:
+    # Target code templates for the operations that emit exactly one line,
+    # formatted positionally with the instruction arguments
+    _FMT = {
+        '=': "MOV {0}, {1}",
+        '+': "ADD {0}, {1}, {2}",
+        '-': "SUB {0}, {1}, {2}",
+        '*': "MUL {0}, {1}, {2}",
+        '/': "DIV {0}, {1}, {2}",
+        'goto': "JMP {0}",
+        'label': "label {0}",
+        'param': "PUSH {0}",
+        'call': "CALL {0}",
+        'return': "RETURN",
+    }
+    _FMT.update(dict.fromkeys(COMPARISON_OPERATORS, "CMP {1}, {2}"))  # The result operand is not encoded
+
+    # Number of lines each multi-line operation emits, every other operation emits one
+    _LINE_COUNTS = {'if': 2, 'select': 3}
+
+    # Jumps taken when a branch condition is false, keeping the body on the fall-through path
+    _INVERTED_JUMPS = {'<': 'JGE', '<=': 'JG', '>': 'JLE', '>=': 'JL', '==': 'JNE', '!=': 'JE'}
+
+    # Condition codes of the comparison operators, as used by CMOVcc
+    _CONDITION_CODES = {'<': 'L', '<=': 'LE', '>': 'G', '>=': 'GE', '==': 'E', '!=': 'NE'}
+
     def __init__(self):
         self.code = []  # Store the generated target code
         self.visited_labels = set()  # Track visited labels
 
+        # Map each IR operation to its emitter, built once so that
+        # process_instruction does a single lookup instead of an if/elif chain
+        self._dispatch = {
+            '=': self.assign,
+            '+': self.add,
+            '-': self.subtract,
+            '*': self.multiply,  # Handle multiplication
+            '/': self.divide,  # Handle division
+            'if': self.conditional_jump,
+            'select': self.select,
+            'goto': self.goto,
+            'label': self.label,
+            'param': self.param,
+            'call': self.call,
+            'return': lambda *args: self.return_value(),
+            'print': self._print_joined,
+        }
+        # Comparison operators all share one emitter, with the operator bound in
+        for operator in COMPARISON_OPERATORS:
+            self._dispatch[operator] = partial(self.compare, operator=operator)
+
     def process_instruction(self, instruction):
         """Process a single instruction and generate the target code."""
         if not instruction:
             return
 
-        operation = instruction.op
-        args = instruction.args
-
-        if operation == '=':
-            self.assign(args[0], args[1])
-        elif operation == '+':
-            self.add(args[0], args[1], args[2])
-        elif operation == '-':
-            self.subtract(args[0], args[1], args[2])
-        elif operation == '*':
-            self.multiply(args[0], args[1], args[2])  # Handle multiplication
-        elif operation == '/':
-            self.divide(args[0], args[1], args[2])  # Handle division
-        elif operation in ('<', '>', '<=', '>=', '=='):
-            self.compare(args[0], args[1], args[2], operation)
-        elif operation == 'if':
-            self.conditional_jump(args[0], args[1], args[2])
-        elif operation == 'goto':
-            self.goto(args[0])
-        elif operation == 'label':
-            self.label(args[0])
-        elif operation == 'param':
-            self.param(args[0])
-        elif operation == 'call':
-            self.call(args[0])
-        elif operation == 'return':
-            self.return_value()
-        elif operation == 'print':
-            self.print_statement(" ".join(args))
-        else:
-            print(f"Warning: Unsupported operation {operation} with arguments {args}")
+        emit = self._dispatch.get(instruction.op)
+        if emit is None:
+            print(f"Warning: Unsupported operation {instruction.op} with arguments {instruction.args}")
+            return
+        emit(*instruction.args)
 
     def assign(self, var, value):
         self.code.append(f"MOV {var}, {value}")
@@ -61,29 +85,30 @@ class CodeGenerator:
         """Generate target code for comparison based on operator."""
         self.code.append(f"CMP {operand1}, {operand2}")
 
-    def conditional_jump(self, condition, cond_op, label):
-        """Generate target code for conditional jump operation."""
-        if cond_op == "goto":
-            self.code.append(f"JMP {label}")
-        elif cond_op == "if":
-            # Compare the condition to zero (non-zero means true)
-            self.code.append(f"CMP {condition}, 0")
-            self.code.append(f"JNE {label}")  # Jump if condition is true (non-zero)
-        elif cond_op == "<":
-            self.code.append(f"CMP {condition}, 20")  # Compare condition (e.g., c) to 20
-            self.code.append(f"JL {label}")  # Jump if less than
-        elif cond_op == ">":
-            self.code.append(f"CMP {condition}, 0")  # Compare condition (e.g., c) to 0
-            self.code.append(f"JG {label}")  # Jump if greater than
-        elif cond_op == "==":
-            self.code.append(f"CMP {condition}, 0")  # Compare condition (e.g., c) to 0
-            self.code.append(f"JE {label}")  # Jump if equal
-        elif cond_op == "<=":
-            self.code.append(f"CMP {condition}, 20")  # Compare condition (e.g., c) to 20
-            self.code.append(f"JLE {label}")  # Jump if less than or equal
-        elif cond_op == ">=":
-            self.code.append(f"CMP {condition}, 20")  # Compare condition (e.g., c) to 20
-            self.code.append(f"JGE {label}")  # Jump if greater than or equal
+    def conditional_jump(self, lhs, cmp_op, rhs, label):
+        """Generate target code for a conditional jump operation.
+
+        The IR jumps to the label when `lhs cmp_op rhs` is false, so the
+        comparison is followed by the inverted jump and only the exit path
+        takes the branch.
+        """
+        self.code.extend(self._conditional_jump_lines(lhs, cmp_op, rhs, label))
+
+    def _conditional_jump_lines(self, lhs, cmp_op, rhs, label):
+        return (f"CMP {lhs}, {rhs}", f"{self._INVERTED_JUMPS[cmp_op]} {label}")
+
+    def select(self, result, cmp_op, lhs, rhs, true_value, false_value):
+        """Generate branchless target code for `result = lhs cmp_op rhs ? true_value : false_value`.
+
+        The comparison comes first, so the result may also be one of its
+        operands, followed by an unconditional and a conditional move.
+        """
+        self.code.extend(self._select_lines(result, cmp_op, lhs, rhs, true_value, false_value))
+
+    def _select_lines(self, result, cmp_op, lhs, rhs, true_value, false_value):
+        return (f"CMP {lhs}, {rhs}",
+                f"MOV {result}, {false_value}",
+                f"CMOV{self._CONDITION_CODES[cmp_op]} {result}, {true_value}")
 
     def goto(self, label):
         self.code.append(f"JMP {label}")
@@ -101,13 +126,54 @@ class CodeGenerator:
         self.code.append(f"RETURN")
 
     def print_statement(self, statement):
+        # Kept for API compatibility only, 'print' instructions go through _print_joined
         self.code.append(f"PRINT {statement}")
 
+    @staticmethod
+    def _print_line(args):
+        """Format the PRINT line for the arguments of a 'print' instruction."""
+        return "PRINT " + args[0] if len(args) == 1 else "PRINT " + " ".join(args)
+
+    def _print_joined(self, *args):
+        self.code.append(self._print_line(args))
+
     def generate_target_code(self, instructions):
+        """Generate target code for a sequence or iterable of IR instructions in a single pass.
+
+        Lines are written by index into a buffer sized to the exact number of
+        lines the instructions emit, which is appended to self.code at the end.
+        """
+        if not isinstance(instructions, (list, tuple)):
+            instructions = list(instructions)  # Generators and iterators can only be walked once
+        fmt = self._FMT
+        line_counts = self._LINE_COUNTS
+        multi_line = {'if': self._conditional_jump_lines, 'select': self._select_lines}
+        print_line = self._print_line
+        lines = [None] * sum(line_counts.get(instruction.op, 1) for instruction in instructions if instruction)
+        i = 0
         for instruction in instructions:
-            self.process_instruction(instruction)
+            if not instruction:
+                continue
+            op = instruction.op
+            template = fmt.get(op)
+            if template is not None:
+                lines[i] = template.format(*instruction.args)
+                i += 1
+            elif op == 'print':
+                lines[i] = print_line(instruction.args)
+                i += 1
+            elif op in multi_line:
+                emitted = multi_line[op](*instruction.args)
+                lines[i:i + len(emitted)] = emitted  # Same length, nothing after it moves
+                i += len(emitted)
+            else:
+                # Unsupported operations only print a warning and emit nothing
+                self.process_instruction(instruction)
+        del lines[i:]
+        self.code.extend(lines)
 
     def get_generated_code(self):
+        # Joined on every call, self.code is public and may be replaced or edited in place
         return "\n".join(self.code)
 
 # Example usage
@@ -136,15 +202,16 @@ if __name__ == '__main__':
     # Assuming you have a parser and IR generator
     from parser import parser
     from ir_generator import IRGenerator
-    from optimizer import IROptimizer
+    from optimizer import ConstFoldPass, IROptimizer
 
     # Parse the data and generate IR
     ast = parser.parse(data)
     ir_generator = IRGenerator()
     instructions = ir_generator.generate(ast)
 
-    # Optimize the instructions
-    optimizer = IROptimizer()
+    # Fold constants, then optimize the instructions
+    instructions = ConstFoldPass().run(instructions)
+    optimizer = IROptimizer(ir_generator.temps)
     instructions = optimizer.optimize(instructions)
 
     # Print the optimized instructions for debugging
@@ -1,82 +1,278 @@
+# Opcodes of the assembled program
+OP_NOP, OP_MOV, OP_ADD, OP_SUB, OP_CMP, OP_JUMP, OP_PRINT, OP_WHILE, OP_CMOV = range(9)
+
+# Condition codes as bitmasks over the sign of the last comparison:
+# bit 0 is set when less, bit 1 when equal and bit 2 when greater
+CONDITION_MASKS = {"E": 0b010, "NE": 0b101, "L": 0b001, "LE": 0b011, "G": 0b100, "GE": 0b110}
+JUMP_MASKS = {"JMP": 0b111}
+JUMP_MASKS.update({f"J{code}": mask for code, mask in CONDITION_MASKS.items()})
+CMOV_MASKS = {f"CMOV{code}": mask for code, mask in CONDITION_MASKS.items()}
+
+# Compiled with Numba by _load_native, never called as plain Python
+def _run_native(opcodes, dst, src1, src2, symtab, defined, order, state):
+    """Run the lowered program natively until it ends or needs Python.
+
+    ``state`` holds the program counter, the sign of the last comparison
+    and the number of defined variables. Returns the index of
+    the instruction that has to be handled in Python (PRINT or a jump to
+    an undefined label), or the program length once it is finished.
+    """
+    pc = state[0]
+    last_cmp = state[1]
+    count = state[2]
+    n = opcodes.shape[0]
+    while pc < n:
+        op = opcodes[pc]
+        if op == OP_MOV or op == OP_ADD or op == OP_SUB or (op == OP_CMOV and (src2[pc] >> (last_cmp + 1)) & 1):
+            if op == OP_MOV or op == OP_CMOV:
+                value = symtab[src1[pc]]
+            elif op == OP_ADD:
+                value = symtab[src1[pc]] + symtab[src2[pc]]
+            else:
+                value = symtab[src1[pc]] - symtab[src2[pc]]
+            d = dst[pc]
+            symtab[d] = value
+            if not defined[d]:
+                defined[d] = True
+                order[count] = d
+                count += 1
+        elif op == OP_CMP:
+            left = symtab[src1[pc]]
+            right = symtab[src2[pc]]
+            last_cmp = (left > right) - (left < right)
+        elif op == OP_JUMP and (src1[pc] >> (last_cmp + 1)) & 1:
+            if dst[pc] < 0:
+                break
+            pc = dst[pc]  # Land on the label, so the increment resumes after it
+        elif op == OP_PRINT:
+            break
+        pc += 1
+    state[0] = pc
+    state[1] = last_cmp
+    state[2] = count
+    return pc
+
+_native = None  # (numpy, compiled _run_native) once loaded, False if Numba is missing
+
+def _load_native():
+    """Import NumPy and Numba and compile the native loop on first use.
+
+    Importing Numba is slow, so it only happens the first time a program
+    runs with use_jit. Returns (numpy, compiled loop), or None when Numba
+    is not installed.
+    """
+    global _native
+    if _native is None:
+        try:
+            import numpy as np
+            from numba import njit
+        except ImportError:  # Numba is optional, the pure Python loop is always available
+            _native = False
+        else:
+            _native = (np, njit(cache=True)(_run_native))
+    return _native or None
+
 class SimpleInterpreter:
-    def __init__(self, instructions):
+    def __init__(self, instructions, use_jit=False):
         self.instructions = instructions
-        self.symbol_table = {}  # Stores variable values
+        self.use_jit = use_jit  # Run with Numba when it is installed
+        self.program = []  # Assembled instructions as (opcode, operands...) tuples
+        self.name_to_id = {}  # Interned variable name -> index into self.vars
+        self.literal_ids = {}  # Integer literal -> index of its constant slot in self.vars
+        self.names = []  # Variable names by id, None for constant slots
+        self.vars = []  # Stores variable values and literal constants, indexed by id
+        self.defined = []  # Whether each variable has been assigned yet
+        self.assigned = []  # Variable ids in order of first assignment
         self.labels = {}  # Stores label positions in the instruction list
         self.pc = 0  # Program counter
-        self.last_cmp = None  # Stores the result of the last comparison
+        self.last_cmp = 0  # Sign of the last comparison: -1 less, 0 equal, 1 greater
 
     def execute(self):
-        # Preprocess labels
-        self._preprocess_labels()
-        
+        # Parse every instruction once and resolve labels before running
+        self._assemble()
+
+        # WHILE re-enters the executor recursively, so it always runs in Python
+        if self.use_jit and all(instr[0] != OP_WHILE for instr in self.program) and _load_native() is not None:
+            self._execute_native()
+            return
+
         # Execute instructions
-        while self.pc < len(self.instructions):
-            instr = self.instructions[self.pc]
-            self._execute_instruction(instr)
+        program = self.program
+        while self.pc < len(program):
+            self._execute_instruction(program[self.pc])
             self.pc += 1
 
-    def _preprocess_labels(self):
-        """Preprocess labels to map them to instruction indices."""
+    def _lower(self, np):
+        """Lower the assembled program into parallel NumPy arrays for the native loop.
+
+        Operands are already slot ids of self.vars, so they are copied as-is.
+        """
+        n = len(self.program)
+        opcodes = np.zeros(n, dtype=np.int32)
+        dst = np.zeros(n, dtype=np.int32)
+        src1 = np.zeros(n, dtype=np.int32)
+        src2 = np.zeros(n, dtype=np.int32)
+
+        for pc, instr in enumerate(self.program):
+            op = instr[0]
+            opcodes[pc] = op
+            if op == OP_MOV or op == OP_PRINT:
+                dst[pc] = instr[1]
+                src1[pc] = instr[2] if op == OP_MOV else 0
+            elif op == OP_ADD or op == OP_SUB or op == OP_CMOV:
+                dst[pc] = instr[1]
+                src1[pc] = instr[2]
+                src2[pc] = instr[3]
+            elif op == OP_CMP:
+                src1[pc] = instr[1]
+                src2[pc] = instr[2]
+            elif op == OP_JUMP:
+                dst[pc] = -1 if instr[1] is None else instr[1]
+                src1[pc] = instr[3]
+
+        symtab = np.array(self.vars, dtype=np.int64)
+        return opcodes, dst, src1, src2, symtab
+
+    def _execute_native(self):
+        """Execute the program with the Numba-compiled loop, printing from Python."""
+        np, run_native = _load_native()
+        opcodes, dst, src1, src2, symtab = self._lower(np)
+        defined = np.array(self.defined, dtype=np.bool_)
+        order = np.zeros(len(symtab), dtype=np.int64)  # Slots in order of first assignment
+        order[:len(self.assigned)] = self.assigned
+        state = np.array([self.pc, self.last_cmp, len(self.assigned)], dtype=np.int64)
+
+        try:
+            while run_native(opcodes, dst, src1, src2, symtab, defined, order, state) < len(opcodes):
+                pc = state[0]
+                instr = self.program[pc]
+                if instr[0] != OP_PRINT:
+                    raise KeyError(instr[2])  # Jump to an undefined label
+                slot = dst[pc]
+                print(int(symtab[slot]) if defined[slot] else instr[2])
+                state[0] = pc + 1
+        finally:
+            # Mirror the native state back so the interpreter looks the same either way
+            self.pc = int(state[0])
+            self.last_cmp = int(state[1])
+            self.vars = [int(value) for value in symtab]
+            self.defined = [bool(flag) for flag in defined]
+            self.assigned = [int(slot) for slot in order[:state[2]]]
+
+    def _assemble(self):
+        """Assemble the textual instructions into (opcode, operands...) tuples.
+
+        Each instruction string is split exactly once: the first pass decodes
+        it and maps labels to instruction indices, the second resolves jump
+        targets to the index of their label and turns every operand into a
+        slot id of self.vars. Literals get constant slots, so execution never
+        checks what kind of operand it is reading. A taken jump sets the
+        program counter to its target as-is, so the no-op label is skipped.
+        """
+        decoded = []
         for idx, instr in enumerate(self.instructions):
-            if instr.startswith("label"):
-                _, label_name = instr.split(" ", 1)
-                self.labels[label_name] = idx
+            parts = instr.split(" ", 1)
+            operation = parts[0]
+            if operation.startswith("label") and len(parts) > 1:
+                self.labels[parts[1]] = idx
+            decoded.append((operation, parts[1].split(", ") if len(parts) > 1 else []))
+        self.program = [self._assemble_instruction(operation, args) for operation, args in decoded]
 
-    def _execute_instruction(self, instr):
-        """Execute a single instruction."""
-        parts = instr.split(" ", 1)
-        operation = parts[0]
-        args = parts[1].split(", ") if len(parts) > 1 else []
+        # Variables are unassigned until the program stores to them
+        missing = len(self.names) - len(self.vars)
+        self.vars.extend([0] * missing)
+        self.defined.extend([False] * missing)
+        for value, slot in self.literal_ids.items():
+            self.vars[slot] = value
 
+    def _assemble_instruction(self, operation, args):
+        """Build the tuple for a decoded instruction, resolving jump targets."""
         if operation == "MOV":
-            if args[1].isdigit():
-                self.symbol_table[args[0]] = int(args[1])
-            else:
-                if args[1] in self.symbol_table:
-                    self.symbol_table[args[0]] = self.symbol_table[args[1]]
-                else:
-                    self.symbol_table[args[0]] = 0
+            return (OP_MOV, self._intern(args[0]), self._operand(args[1]))
         elif operation == "ADD":
-            self.symbol_table[args[0]] = self._get_value(args[1]) + self._get_value(args[2])
+            return (OP_ADD, self._intern(args[0]), self._operand(args[1]), self._operand(args[2]))
         elif operation == "SUB":
-            self.symbol_table[args[0]] = self._get_value(args[1]) - self._get_value(args[2])
+            return (OP_SUB, self._intern(args[0]), self._operand(args[1]), self._operand(args[2]))
         elif operation == "CMP":
-            self.last_cmp = self._get_value(args[0]) < self._get_value(args[1])
-        elif operation == "JMP":
-            self.pc = self.labels[args[0]] - 1  # Jump to the label
+            return (OP_CMP, self._operand(args[0]), self._operand(args[1]))
+        elif operation in CMOV_MASKS:
+            return (OP_CMOV, self._intern(args[0]), self._operand(args[1]), CMOV_MASKS[operation])
+        elif operation in JUMP_MASKS:
+            return (OP_JUMP, self.labels.get(args[0]), args[0], JUMP_MASKS[operation])
         elif operation == "PRINT":
-            value = self.symbol_table.get(args[0], " ".join(args).strip('"'))
-            print(value)
-        elif operation.startswith("J"):  # Handle conditional jumps
-            if operation == "JMP" or (operation == "JGE" and not self.last_cmp):
-                self.pc = self.labels[args[0]] - 1
-        elif operation.startswith("label"):
-            pass  # Labels are just markers, nothing to execute
+            # Printed as-is when the argument is not an assigned variable at run time
+            return (OP_PRINT, self._intern(args[0]), " ".join(args).strip('"'))
         elif operation == "WHILE":
+            return (OP_WHILE, self._operand(args[0]), self._operand(args[1]))
+        # Labels and unsupported operations do nothing
+        return (OP_NOP,)
+
+    def _intern(self, name):
+        """Return the id of a variable name, allocating one on first sight."""
+        var_id = self.name_to_id.get(name)
+        if var_id is None:
+            var_id = self.name_to_id[name] = len(self.names)
+            self.names.append(name)
+        return var_id
+
+    def _operand(self, operand):
+        """Return the slot of an operand: a constant slot for integer literals, else the variable id."""
+        if operand.isdigit() or (operand[:1] == "-" and operand[1:].isdigit()):  # Folding can produce negatives
+            value = int(operand)
+            slot = self.literal_ids.get(value)
+            if slot is None:
+                slot = self.literal_ids[value] = len(self.names)
+                self.names.append(None)
+            return slot
+        return self._intern(operand)
+
+    def _execute_instruction(self, instr):
+        """Execute a single assembled instruction."""
+        op = instr[0]
+        values = self.vars
+
+        if op == OP_MOV or op == OP_ADD or op == OP_SUB or (op == OP_CMOV and (instr[3] >> (self.last_cmp + 1)) & 1):
+            if op == OP_MOV or op == OP_CMOV:
+                result = values[instr[2]]
+            elif op == OP_ADD:
+                result = values[instr[2]] + values[instr[3]]
+            else:
+                result = values[instr[2]] - values[instr[3]]
+            var_id = instr[1]
+            values[var_id] = result
+            if not self.defined[var_id]:
+                self.defined[var_id] = True
+                self.assigned.append(var_id)
+        elif op == OP_CMP:
+            left = values[instr[1]]
+            right = values[instr[2]]
+            self.last_cmp = (left > right) - (left < right)
+        elif op == OP_JUMP and (instr[3] >> (self.last_cmp + 1)) & 1:
+            target = instr[1]
+            if target is None:
+                raise KeyError(instr[2])
+            self.pc = target  # Land on the label, so the increment resumes after it
+        elif op == OP_PRINT:
+            var_id = instr[1]
+            print(values[var_id] if self.defined[var_id] else instr[2])
+        elif op == OP_WHILE:
             # Handle the while loop
-            while self._get_value(args[0]) < self._get_value(args[1]):
+            while values[instr[1]] < values[instr[2]]:
                 # Execute the body of the loop
                 self.pc += 1  # Continue to the next instruction within the while loop
-                self._execute_instruction(self.instructions[self.pc])
+                self._execute_instruction(self.program[self.pc])
             # Exit the loop when condition fails
-            return
-
-    def _get_value(self, operand):
-        """Return the value of an operand, which could be a variable or a literal number."""
-        if operand.isdigit():
-            return int(operand)
-        return self.symbol_table.get(operand, 0)
 
     def get_symbol_table(self):
-        return self.symbol_table
+        """Build the variable name -> value mapping of the assigned variables."""
+        return {self.names[var_id]: self.vars[var_id] for var_id in self.assigned}
 
 
 # Example usage
 if __name__ == "__main__":
     from parser import parser
     from ir_generator import IRGenerator
-    from optimizer import IROptimizer
+    from optimizer import ConstFoldPass, IROptimizer
     from code_gen import CodeGenerator
 
     data = '''
@@ -96,7 +292,8 @@ if __name__ == "__main__":
     ast = parser.parse(data)
     ir_generator = IRGenerator()
     instructions = ir_generator.generate(ast)
-    optimizer = IROptimizer()
+    instructions = ConstFoldPass().run(instructions)
+    optimizer = IROptimizer(ir_generator.temps)
     instructions = optimizer.optimize(instructions)
     code_gen = CodeGenerator()
     code_gen.generate_target_code(instructions)
@@ -1,39 +1,85 @@
-from parser import Program, VariableDeclaration, AssignStatement, FunctionDefinition, ReturnStatement, WhileStatement, IfStatement
+from collections import Counter
+from functools import lru_cache
+from typing import NamedTuple
+from parser import Program, VariableDeclaration, AssignStatement, FunctionDefinition, ReturnStatement, WhileStatement, IfStatement, FunctionCall, PrintStatement, Identifier
 
-class IRInstruction:
-    def __init__(self, op, *args):
-        self.op = op  # Operation type (e.g., '=', 'call', 'jump')
-        self.args = args  # Arguments for the operation (can be multiple)
+COMPARISON_OPERATORS = frozenset(('<', '>', '<=', '>=', '==', '!='))  # Conditions lowered to a compare and branch
+
+class IRInstruction(NamedTuple):
+    """A single IR instruction, stored as an immutable (op, args) tuple."""
+    op: str  # Operation type (e.g., '=', 'call', 'jump')
+    args: tuple  # Arguments for the operation (can be multiple)
 
     def __repr__(self):
         # Represent the instruction in a readable format (correct TAC format)
         return f"{self.op} {' '.join(map(str, self.args))}"
 
+@lru_cache(maxsize=256, typed=True)  # Typed, so True and 1 keep their own reprs
+def _fmt_number(node):
+    """Format a numeric literal for the IR; source programs use few distinct constants."""
+    if isinstance(node, float) and node.is_integer():
+        return str(int(node))  
+    if isinstance(node, float):  # If it's a float, format it
+        return f"{node:.6f}"  # Represent float in TAC with precision
+    elif isinstance(node, int):  # If it's an integer
+        return str(node)  # Return integer as it is
+    return str(node)  # Otherwise, treat it as an identifier (string)
+
 class IRGenerator:
     def __init__(self):
         self.instructions = []  # Store generated IR instructions
         self.temp_counter = 0   # Counter for temporary variables
         self.label_counter = 0  # Counter for labels
+        self.temps = set()  # Names of the generated temporary variables
+
+        # Map each node type straight to its visitor so visit() is a single lookup
+        self._visitors = {
+            int: self.visit_number,
+            float: self.visit_number,
+            bool: self.visit_number,
+            str: self.visit_string,  # Handle strings here
+            tuple: self.visit_tuple,  # Handle binary expressions as tuples
+            Identifier: self.visit_Identifier,
+            Program: self.visit_Program,
+            VariableDeclaration: self.visit_VariableDeclaration,
+            AssignStatement: self.visit_AssignStatement,
+            FunctionDefinition: self.visit_FunctionDefinition,
+            ReturnStatement: self.visit_ReturnStatement,
+            FunctionCall: self.visit_FunctionCall,
+            PrintStatement: self.visit_PrintStatement,
+            WhileStatement: self.visit_WhileStatement,
+            IfStatement: self.visit_IfStatement,  # Handle if-else
+        }
 
     def generate(self, ast):
         """Start generating IR from the AST."""
         self.visit(ast)
+        self.instructions = self.fuse_temporaries(self.instructions)
         return self.instructions
 
+    def fuse_temporaries(self, instructions):
+        """Fold a single-use temporary copy into the assignment that consumes it.
+
+        Every temporary is assigned exactly once, so `t = v` immediately
+        followed by `x = t`, with no other use of `t`, becomes `x = v`.
+        """
+        uses = Counter(arg for instr in instructions for arg in instr.args if arg in self.temps)
+        fused = []
+        for instr in instructions:
+            if instr.op == '=' and fused and uses[instr.args[1]] == 2:  # Its definition plus this use
+                previous = fused[-1]
+                if previous.op == '=' and previous.args[0] == instr.args[1]:
+                    fused[-1] = IRInstruction('=', (instr.args[0], previous.args[1]))
+                    continue
+            fused.append(instr)
+        return fused
+
     def visit(self, node):
         """Dispatch to the appropriate visitor method."""
-        if isinstance(node, (int, float)):
-            return self.visit_number(node)
-        elif isinstance(node, str):  # Handle strings here
-            return self.visit_string(node)
-        elif isinstance(node, tuple):
-            return self.visit_tuple(node)  # Handle binary expressions as tuples
-        elif isinstance(node, WhileStatement):
-            return self.visit_WhileStatement(node)
-        elif isinstance(node, IfStatement):
-            return self.visit_IfStatement(node)  # Handle if-else
-        method_name = f"visit_{type(node).__name__}"
-        visitor = getattr(self, method_name, self.generic_visit)
+        visitor = self._visitors.get(type(node))
+        if visitor is None:
+            method_name = f"visit_{type(node).__name__}"
+            visitor = getattr(self, method_name, self.generic_visit)
         return visitor(node)
 
     def generic_visit(self, node):
@@ -63,14 +109,19 @@ class IRGenerator:
         else:
             value = self.visit(node.value)
 
+        if node.value is None or isinstance(node.value, (int, float, str, Identifier)):
+            # Constants and bare identifiers need no temporary
+            self.instructions.append(IRInstruction('=', (node.identifier, value)))  # x = value
+            return
+
         temp = self.get_temp_variable()
-        self.instructions.append(IRInstruction('=', temp, value))  # t1 = value (temporary assignment)
-        self.instructions.append(IRInstruction('=', node.identifier, temp))  # x = t1 (assign temp to variable)
+        self.instructions.append(IRInstruction('=', (temp, value)))  # t1 = value (temporary assignment)
+        self.instructions.append(IRInstruction('=', (node.identifier, temp)))  # x = t1 (assign temp to variable)
 
     def visit_AssignStatement(self, node):
         """Handle assignment statements."""
         value = self.visit(node.value)  # Visit the assigned value (expression)
-        self.instructions.append(IRInstruction('=', node.identifier, value))  # x = value (assignment to variable)
+        self.instructions.append(IRInstruction('=', (node.identifier, value)))  # x = value (assignment to variable)
 
     def visit_FunctionDefinition(self, node):
         """Handle function definition and generate its IR."""
@@ -81,24 +132,24 @@ class IRGenerator:
         end_function_label = f"end_{function_label}"  # Create end label for the function
 
         # Function entry label
-        self.instructions.append(IRInstruction('label', function_label))  # Label for function entry
+        self.instructions.append(IRInstruction('label', (function_label,)))  # Label for function entry
 
         # Handle parameters as local variables
         for idx, param in enumerate(node.parameters):
             param_name = param[1]  # Extract parameter name
-            self.instructions.append(IRInstruction('param', param_name))  # Generate parameter IR
+            self.instructions.append(IRInstruction('param', (param_name,)))  # Generate parameter IR
         
         # Visit the function body
         for statement in node.body.statements:
             if isinstance(statement, ReturnStatement):
                 return_stmt = statement
                 return_value = self.visit(return_stmt.value)
-                self.instructions.append(IRInstruction('return', return_value))  # return value from function
+                self.instructions.append(IRInstruction('return', (return_value,)))  # return value from function
             else:
                 self.visit(statement)
 
         # Function exit label
-        self.instructions.append(IRInstruction('label', end_function_label))  # Label for function exit
+        self.instructions.append(IRInstruction('label', (end_function_label,)))  # Label for function exit
 
     def visit_ReturnStatement(self, node):
         """Handle return statements."""
@@ -112,27 +163,27 @@ class IRGenerator:
 
         # Generate a temporary variable for the result
         temp = self.get_temp_variable()
-        self.instructions.append(IRInstruction(operator, temp, left, right))  # t1 = left operator right
+        self.instructions.append(IRInstruction(operator, (temp, left, right)))  # t1 = left operator right
         return temp  # Return the temporary variable holding the result
 
     def visit_number(self, node):
         """Handle both integers and floats."""
-        if isinstance(node, float) and node.is_integer():
-            return str(int(node))  
-        if isinstance(node, float):  # If it's a float, format it
-            return f"{node:.6f}"  # Represent float in TAC with precision
-        elif isinstance(node, int):  # If it's an integer
-            return str(node)  # Return integer as it is
-        return str(node)  # Otherwise, treat it as an identifier (string)
+        return _fmt_number(node)
 
     def visit_string(self, node):
         """Handle string literals."""
         return f'{node}'  # Return the string with proper quotes for TAC
 
+    def visit_Identifier(self, node):
+        """Handle variable references."""
+        return node.name
+
     def get_temp_variable(self):
         """Generate a new temporary variable."""
         self.temp_counter += 1
-        return f"t{self.temp_counter}"
+        temp = f"t{self.temp_counter}"
+        self.temps.add(temp)
+        return temp
 
     def get_function_label(self, function_name):
         """Generate a unique label for the function."""
@@ -141,64 +192,113 @@ class IRGenerator:
     def visit_FunctionCall(self, node):
         """Handle function calls."""
         if node.function_name == 'print':
-            self.instructions.append(IRInstruction('print', self.visit(node.arguments[0])))
+            self.instructions.append(IRInstruction('print', (self.visit(node.arguments[0]),)))
             return
 
         for idx, arg in enumerate(node.arguments):
-            self.instructions.append(IRInstruction('param', self.visit(arg)))  # Pass arguments as parameters
+            self.instructions.append(IRInstruction('param', (self.visit(arg),)))  # Pass arguments as parameters
         
         function_label = self.get_function_label(node.function_name)
         temp_var = self.get_temp_variable()  # Generate a temporary variable for the return value
-        self.instructions.append(IRInstruction('call', function_label))  # Call the function
-        self.instructions.append(IRInstruction('=', temp_var, 'return_value'))  # Capture return value
+        self.instructions.append(IRInstruction('call', (function_label,)))  # Call the function
+        self.instructions.append(IRInstruction('=', (temp_var, 'return_value')))  # Capture return value
 
         return temp_var  # Return the temporary variable that holds the return value
 
 
     def visit_PrintStatement(self, node):
         """Handle print statements."""
-        self.instructions.append(IRInstruction('print', self.visit(node.value)))
+        self.instructions.append(IRInstruction('print', (self.visit(node.value),)))
 
     def visit_WhileStatement(self, node):
         """Handle while loop statements."""
         start_label = self.get_label()
         end_label = self.get_label()
 
-        self.instructions.append(IRInstruction('label', start_label))
-        condition = self.visit(node.condition)
-        self.instructions.append(IRInstruction('if', condition, 'goto', end_label))
+        self.instructions.append(IRInstruction('label', (start_label,)))
+        self.branch_if_false(node.condition, end_label)  # Leave the loop once the condition fails
 
         for statement in node.body.statements:
             self.visit(statement)
 
-        self.instructions.append(IRInstruction('goto', start_label))
-        self.instructions.append(IRInstruction('label', end_label))
+        self.instructions.append(IRInstruction('goto', (start_label,)))
+        self.instructions.append(IRInstruction('label', (end_label,)))
 
     def visit_IfStatement(self, node):
         """Handle if-else statements."""
+        if self.visit_select(node):
+            return
+
         # Generate labels for the if-else branches
-        else_label = self.get_label()
+        else_label = self.get_label() if node.else_body else None
         end_label = self.get_label()
 
-        # Evaluate the condition of the if statement
-        condition = self.visit(node.condition)
-        self.instructions.append(IRInstruction('if', condition, 'goto', else_label))  # If condition is false, jump to else
+        # If condition is false, jump to else (or past the if-block when there is none)
+        self.branch_if_false(node.condition, else_label or end_label)
 
         # Visit the if-block
         for statement in node.body.statements:
             self.visit(statement)
 
-        # After the if-block, jump to the end of the if-else
-        self.instructions.append(IRInstruction('goto', end_label))
-
         # Handle the else-block if present
         if node.else_body:  # Check if else_body exists
-            self.instructions.append(IRInstruction('label', else_label))
+            # After the if-block, jump to the end of the if-else
+            self.instructions.append(IRInstruction('goto', (end_label,)))
+            self.instructions.append(IRInstruction('label', (else_label,)))
             for statement in node.else_body.statements:
                 self.visit(statement)
 
         # End of if-else block
-        self.instructions.append(IRInstruction('label', end_label))
+        self.instructions.append(IRInstruction('label', (end_label,)))
+
+    def visit_select(self, node):
+        """Lower `if (a op b) x = u; else x = v;` to a branchless select.
+
+        Applies when both branches are a single assignment of a constant or
+        variable to the same identifier, and the true value is not the
+        identifier itself. Emits `select x op a b u v` and
+        returns True, or returns False to fall back to labels and jumps.
+        """
+        condition = node.condition
+        if not (node.else_body and isinstance(condition, tuple)
+                and condition[1] in COMPARISON_OPERATORS):
+            return False
+        if len(node.body.statements) != 1 or len(node.else_body.statements) != 1:
+            return False
+        then_stmt = node.body.statements[0]
+        else_stmt = node.else_body.statements[0]
+        if not (isinstance(then_stmt, AssignStatement) and isinstance(else_stmt, AssignStatement)
+                and then_stmt.identifier == else_stmt.identifier):
+            return False
+        if not all(isinstance(stmt.value, (int, float, str, Identifier)) for stmt in (then_stmt, else_stmt)):
+            return False
+        if isinstance(then_stmt.value, Identifier) and then_stmt.value.name == then_stmt.identifier:
+            # The target is overwritten with the false value before the true value is read
+            return False
+
+        lhs = self.visit(condition[0])
+        rhs = self.visit(condition[2])
+        true_value = self.visit(then_stmt.value)
+        false_value = self.visit(else_stmt.value)
+        self.instructions.append(IRInstruction('select', (then_stmt.identifier, condition[1], lhs, rhs, true_value, false_value)))
+        return True
+
+    def branch_if_false(self, condition, label):
+        """Emit an 'if' that jumps to label when the condition does not hold.
+
+        The instruction carries (lhs, operator, rhs, label) so the comparison
+        and the jump are lowered together. Conditions that are not a single
+        comparison are evaluated first and compared against 0.
+        """
+        if isinstance(condition, tuple) and condition[1] in COMPARISON_OPERATORS:
+            lhs = self.visit(condition[0])
+            operator = condition[1]
+            rhs = self.visit(condition[2])
+        else:
+            lhs = self.visit(condition)
+            operator = '!='
+            rhs = '0'
+        self.instructions.append(IRInstruction('if', (lhs, operator, rhs, label)))
 
     def get_label(self):
         """Generate a new label."""
@@ -16,6 +16,7 @@ reserved = {
     'bool': 'BOOL',    # Added boolean type keyword
     'str': 'STR'    # Added string type keyword
 }
+_KEYWORDS = frozenset(reserved)  # Fast membership test for the common non-keyword case
 
 # List of token names
 tokens = (
@@ -25,7 +26,6 @@ tokens = (
 ) + tuple(reserved.values())
 
 # Regular expressions for the tokens
-t_FUNCTION = r'function'
 t_NUMBER = r'\d+\.\d+|\d+'  # Matches floating-point and integer numbers
 t_STRING = r'"([^\\"]|\\[nt"\\])*"'  # Matches strings with escape sequences
 t_PLUS = r'\+'
@@ -51,34 +51,19 @@ t_COMMA = r','
 # Handle keywords
 def t_IDENTIFIER(t):
     r'[a-zA-Z_][a-zA-Z0-9_]*'
-    t.type = reserved.get(t.value, 'IDENTIFIER')  # Check if the identifier is a reserved keyword
+    value = t.value
+    if value in _KEYWORDS:  # Check if the identifier is a reserved keyword
+        t.type = reserved[value]
     return t
 
-# Handle type keywords for variable declarations (int, float, bool)
-def t_INT(t):
-    r'int'
-    return t
-
-def t_FLOAT(t):
-    r'float'
-    return t
-
-def t_BOOL(t):
-    r'bool'
-    return t
-def t_STR(t):
-    r'str'
 # A function to handle ignored characters like spaces and tabs
 t_ignore = ' \t'
 
-# Ignore comments by skipping them
-def t_COMMENTSINGLE(t):
-    r'//.*'
-    pass  # Simply ignore single-line comments
-
-def t_COMMENTMULTI(t):
-    r'/\*[\s\S]*?\*/'
-    pass  # Simply ignore multi-line comments
+# Ignore comments by skipping them. Both forms share one rule, defined before
+# the DIVIDE string rule, so a '/' is only tried against one comment pattern
+def t_COMMENT(t):
+    r'//[^\n]*|/\*[\s\S]*?\*/'
+    pass  # Simply ignore single-line and multi-line comments
 
 # Newline handling
 def t_NEWLINE(t):
@@ -90,8 +75,14 @@ def t_error(t):
     print(f"Illegal character '{t.value[0]}' at line {t.lexer.lineno}, column {t.lexpos}")
     t.lexer.skip(1)
 
-# Input source code
-data = '''
+# Create the lexer from the checked-in minilang_lextab.py. optimize=1 loads the table
+# without checking it against the rules above, so delete minilang_lextab.py (and rerun)
+# whenever a token rule, reserved word or the tokens list changes.
+lexer = lex.lex(optimize=1, lextab='minilang_lextab')
+
+if __name__ == '__main__':
+    # Input source code
+    data = '''
     int x;
     float y = 3.14;
     bool z = true;
@@ -114,12 +105,8 @@ data = '''
     if (x == 10) {
         print(x);
     }
-'''
+    '''
 
-# Create the lexer
-lexer = lex.lex()
-
-if __name__ == '__main__':
     # Give the lexer the input data
     lexer.input(data)
 
@@ -0,0 +1,10 @@
+# minilang_lextab.py. This file automatically created by PLY (version 3.11). Don't edit!
+_tabversion   = '3.10'
+_lextokens    = set(('AND', 'BOOL', 'COMMA', 'COMMENT_MULTI', 'COMMENT_SINGLE', 'DIVIDE', 'ELSE', 'EQEQUAL', 'EQUAL', 'FALSE', 'FLOAT', 'FUNCTION', 'GREATER', 'GREATEROREQUAL', 'IDENTIFIER', 'IF', 'INPUT', 'INT', 'LBRACE', 'LESS', 'LESSEQUAL', 'LPAREN', 'MINUS', 'NEQUAL', 'NUMBER', 'OR', 'PLUS', 'PRINT', 'RBRACE', 'RETURN', 'RPAREN', 'SEMICOLON', 'STR', 'STRING', 'TIMES', 'TRUE', 'WHILE'))
+_lexreflags   = 64
+_lexliterals  = ''
+_lexstateinfo = {'INITIAL': 'inclusive'}
+_lexstatere   = {'INITIAL': [('(?P<t_IDENTIFIER>[a-zA-Z_][a-zA-Z0-9_]*)|(?P<t_COMMENT>//[^\\n]*|/\\*[\\s\\S]*?\\*/)|(?P<t_NEWLINE>\\n+)|(?P<t_STRING>"([^\\\\"]|\\\\[nt"\\\\])*")|(?P<t_NUMBER>\\d+\\.\\d+|\\d+)|(?P<t_OR>\\|\\|)|(?P<t_PLUS>\\+)|(?P<t_TIMES>\\*)|(?P<t_LESSEQUAL><=)|(?P<t_EQEQUAL>==)|(?P<t_NEQUAL>!=)|(?P<t_GREATEROREQUAL>>=)|(?P<t_AND>&&)|(?P<t_LPAREN>\\()|(?P<t_RPAREN>\\))|(?P<t_LBRACE>\\{)|(?P<t_RBRACE>\\})|(?P<t_MINUS>-)|(?P<t_DIVIDE>/)|(?P<t_EQUAL>=)|(?P<t_GREATER>>)|(?P<t_LESS><)|(?P<t_SEMICOLON>;)|(?P<t_COMMA>,)', [None, ('t_IDENTIFIER', 'IDENTIFIER'), ('t_COMMENT', 'COMMENT'), ('t_NEWLINE', 'NEWLINE'), (None, 'STRING'), None, (None, 'NUMBER'), (None, 'OR'), (None, 'PLUS'), (None, 'TIMES'), (None, 'LESSEQUAL'), (None, 'EQEQUAL'), (None, 'NEQUAL'), (None, 'GREATEROREQUAL'), (None, 'AND'), (None, 'LPAREN'), (None, 'RPAREN'), (None, 'LBRACE'), (None, 'RBRACE'), (None, 'MINUS'), (None, 'DIVIDE'), (None, 'EQUAL'), (None, 'GREATER'), (None, 'LESS'), (None, 'SEMICOLON'), (None, 'COMMA')])]}
+_lexstateignore = {'INITIAL': ' \t'}
+_lexstateerrorf = {'INITIAL': 't_error'}
+_lexstateeoff = {}
@@ -1,99 +1,302 @@
-from ir_generator import IRInstruction
+import operator
+import re
+import sys
+from collections import deque
+
+from ir_generator import IRInstruction, COMPARISON_OPERATORS
+
+ARITHMETIC_OPERATIONS = frozenset(map(sys.intern, '+-*/'))
+NUMBER_PATTERN = re.compile(r'-?\d+(\.\d+)?')  # Integer and float literals as written in the IR
+NON_DEFINING_OPERATIONS = frozenset(('if', 'goto', 'print', 'param', 'return'))  # Operations that assign no variable
+PURE_OPERATIONS = ARITHMETIC_OPERATIONS.union(('=',), COMPARISON_OPERATORS)  # Removable when their result is unused
+MAX_PASSES = 8  # Upper bound on fold and dead code elimination rounds
+
+def _divide(left, right):
+    """Divide two constants, or return None when the division cannot be folded safely."""
+    if right == 0:
+        return None
+    if isinstance(left, int) and isinstance(right, int):
+        # Keep integer division exact, leave the rest to run time
+        return left // right if left % right == 0 else None
+    return left / right
+
+_FOLD = {'+': operator.add, '-': operator.sub, '*': operator.mul, '/': _divide}  # Folding for each arithmetic operation
+
+# Algebraic identities: (operation, constant, side of the constant) -> what the result is,
+# either one of the operands ('left' or 'right') or a constant
+_IDENTITY = {
+    ('+', 0, 'right'): 'left', ('+', 0, 'left'): 'right',  # x + 0, 0 + x
+    ('-', 0, 'right'): 'left',  # x - 0
+    ('*', 1, 'right'): 'left', ('*', 1, 'left'): 'right',  # x * 1, 1 * x
+    ('*', 0, 'right'): '0', ('*', 0, 'left'): '0',  # x * 0, 0 * x
+    ('/', 1, 'right'): 'left',  # x / 1
+}
+
+def simplify_identity(op, lhs, rhs, left, right):
+    """Return the operand or constant that `lhs op rhs` reduces to, or None if no identity applies.
+
+    left and right are the known values of the operands, or None.
+    """
+    result = None
+    if right is not None:
+        result = _IDENTITY.get((op, right, 'right'))
+    if result is None and left is not None:
+        result = _IDENTITY.get((op, left, 'left'))
+    if result == 'left':
+        return lhs
+    if result == 'right':
+        return rhs
+    return result
 
 class IROptimizer:
-    def __init__(self):
+    def __init__(self, temps=()):
         self.optimized_instructions = []
-        self.variable_values = {}  # Keeps track of variable values (for constant folding)
+        # Names of the temporaries IRGenerator introduced (IRGenerator.temps).
+        # Only these are removed when dead, user variables are never touched.
+        self.temps = frozenset(temps)
+        self.variable_values = {}  # Known constant value of each variable (for constant folding)
         self.in_function = False  # Flag to track if we are inside a function
         self.after_return = False  # Flag to track if we encountered a return in the function
 
     def optimize(self, instructions):
-        """Optimize the given list of instructions."""
-        self.optimized_instructions = []
-        for instruction in instructions:
-            self.optimize_instruction(instruction)
-        return self.optimized_instructions
+        """Optimize the given list of instructions.
+
+        Folding can leave temporaries unused and removing them can expose
+        more folding, so both run in rounds until nothing changes, at most
+        MAX_PASSES times.
+        """
+        current = list(instructions)
+        for _ in range(MAX_PASSES):
+            optimized = self.eliminate_dead_code(self.fold_pass(current))
+            if optimized == current:
+                break
+            current = optimized
+        self.optimized_instructions = current
+        return current
+
+    def fold_pass(self, instructions):
+        """Run one forward pass of folding, propagation and unreachable return removal."""
+        return list(self._iter(instructions))
+
+    def _iter(self, instructions):
+        """Yield the instructions of one fold pass as each one is finalized.
+
+        Function regions are tracked here, in locals, so that only labels pay
+        for the prefix tests; the flags are written back once at the end.
+        """
+        self.variable_values = {}
+        in_function = False
+        after_return = False
+        optimize_instruction = self.optimize_instruction
+        try:
+            for instruction in instructions:
+                op = instruction.op
+                if op == 'label':
+                    label = instruction.args[0]
+                    if label.startswith(('func_', 'end_func_')):
+                        # Entering or exiting a function resets the after_return flag
+                        in_function = label.startswith('func_')
+                        after_return = False
+                    elif after_return:
+                        continue  # Labels after a return are unreachable like the rest of the body
+                elif in_function:
+                    # Skip everything between a return and the end of its function
+                    if after_return:
+                        continue
+                    if op == 'return':
+                        after_return = True
+                        yield instruction  # Keep the return statement
+                        continue
+
+                optimized = optimize_instruction(instruction)
+                if optimized is not None:
+                    yield optimized
+        finally:
+            self.in_function = in_function
+            self.after_return = after_return
+
+    def eliminate_dead_code(self, instructions):
+        """Drop pure assignments to temporaries that are never read, in one backward scan.
+
+        Temporaries are assigned once and only read after their assignment,
+        so a temporary that is not live below its definition is dead.
+        """
+        temps = self.temps
+        live = set()  # Operands read by the instructions after the current one
+        kept = deque()
+        for instruction in reversed(instructions):
+            op, args = instruction.op, instruction.args
+            if op in PURE_OPERATIONS:
+                if args[0] in temps and args[0] not in live:
+                    continue
+                live.update(args[1:])
+            else:
+                live.update(args)
+            kept.appendleft(instruction)
+        return list(kept)
 
     def optimize_instruction(self, instruction):
-        """Optimize individual instruction."""
-        # Handle entering a function
-        if instruction.op == 'label' and instruction.args[0].startswith('func_'):
-            self.in_function = True
-            self.after_return = False  # Reset after_return flag when entering a new function
-
-        # Handle exiting a function
-        if instruction.op == 'label' and self.in_function and instruction.args[0].startswith('end_func_'):
-            self.in_function = False
-            self.after_return = False  # Reset after exiting the function
-
-        # If inside a function and after return, skip further instructions
-        if self.in_function and self.after_return:
-            return
-
-        # Handle return inside a function: mark that we're after the return statement
-        if self.in_function and instruction.op == 'return':
-            self.after_return = True
-            self.optimized_instructions.append(instruction)  # Keep the return statement
-            return
-        
+        """Optimize individual instruction, returning its replacement or None to drop it."""
+        op = instruction.op
+        args = instruction.args
+
+        # A label can be reached with other values and a call can assign any global
+        if op == 'label' or op == 'call':
+            self.variable_values.clear()
+
         # Apply constant folding
-        if instruction.op in ('+', '-', '*', '/'):
+        fold = _FOLD.get(op)
+        if fold is not None:
             # Check if both arguments are constants
-            left = self.evaluate_operand(instruction.args[0])
-            right = self.evaluate_operand(instruction.args[1])
+            left = self.evaluate_operand(args[1])
+            right = self.evaluate_operand(args[2])
 
             if left is not None and right is not None:
                 # Perform the constant folding
-                result = self.evaluate_operation(instruction.op, left, right)
-                # Replace the operation with the constant result
-                temp_var = self.get_temp_variable()
-                self.optimized_instructions.append(IRInstruction('=', temp_var, result))
-                return  # Skip adding the original instruction
-
-        # Handle dead code elimination (e.g., x = x is redundant)
-        if instruction.op == '=' and instruction.args[0] == instruction.args[1]:
-            # Remove redundant assignments
-            return
-
-        # Handle assignments that can be simplified (e.g., assignment to a variable that's already known)
-        if instruction.op == '=':
-            # Check if the variable already has a known value
-            if instruction.args[1] in self.variable_values:
-                # If the value is already known, replace the assignment
-                self.optimized_instructions.append(IRInstruction('=', instruction.args[0], self.variable_values[instruction.args[1]]))
-                return
-            else:
-                # Otherwise, track the variable value
-                self.variable_values[instruction.args[0]] = instruction.args[1]
+                result = fold(left, right)
+                if result is not None:
+                    # Replace the operation with the constant result and remember it
+                    self.variable_values[args[0]] = result
+                    return IRInstruction('=', (args[0], format_constant(result)))  # Instead of the original instruction
+
+            # Otherwise an identity may still turn it into a copy or a constant
+            simplified = simplify_identity(op, args[1], args[2], left, right)
+            if simplified is not None:
+                return self.optimize_instruction(IRInstruction('=', (args[0], simplified)))
+
+        if op == '=':
+            # Handle dead code elimination (e.g., x = x is redundant)
+            if args[0] == args[1]:
+                # Remove redundant assignments
+                return None
+
+            # Handle assignments that can be simplified (e.g., assignment to a variable that's already known)
+            value = self.evaluate_operand(args[1])
+            if value is not None:
+                # Track the constant, so later uses of the variable fold too
+                self.variable_values[args[0]] = value
+                return IRInstruction('=', (args[0], format_constant(value)))
+            # Otherwise the variable no longer holds a known constant
+            self.variable_values.pop(args[0], None)
+        elif op not in NON_DEFINING_OPERATIONS and args:
+            # Any other result overwrites what was known about its target
+            self.variable_values.pop(args[0], None)
 
-        # If instruction produces a result, add it to the optimized instructions
-        self.optimized_instructions.append(instruction)
+        # Otherwise keep the instruction as it is
+        return instruction
 
     def evaluate_operand(self, operand):
         """Evaluate if the operand is a constant value."""
         # Check if the operand is a number (constant)
-        if isinstance(operand, (int, float)):
-            return operand
-        # If operand is a variable, check if its value is already known
-        if operand in self.variable_values:
-            return self.variable_values[operand]
-        return None  # Not a constant
-
-    def evaluate_operation(self, op, left, right):
-        """Perform the arithmetic operation."""
-        if op == '+':
-            return left + right
-        elif op == '-':
-            return left - right
-        elif op == '*':
-            return left * right
-        elif op == '/':
-            return left / right
-        return None
+        value = parse_constant(operand)
+        if value is not None:
+            return value
+        # If operand is a variable, check if its value is already known.
+        # Only resolved constants are stored, so there is no chain to follow.
+        return self.variable_values.get(operand)  # None if not a constant
+
+
+def parse_constant(operand):
+    """Return the numeric value of a literal IR operand, or None if it is not one."""
+    if isinstance(operand, (int, float)) and not isinstance(operand, bool):
+        return operand
+    if isinstance(operand, str) and NUMBER_PATTERN.fullmatch(operand):
+        return float(operand) if '.' in operand else int(operand)
+    return None
+
+
+def format_constant(value):
+    """Format a folded value the way IRGenerator.visit_number writes literals."""
+    if isinstance(value, float) and value.is_integer():
+        return str(int(value))
+    if isinstance(value, float):
+        return f"{value:.6f}"
+    return str(value)
+
+
+class ConstFoldPass:
+    """Fold constant arithmetic and propagate constants through the IR in one walk.
+
+    Known values only live inside straight-line code: every label may be
+    reached with different values and a call may assign any global, so both
+    forget everything that is known. Assigning a non-constant to a variable
+    forgets that variable.
+    """
+
+    def __init__(self):
+        self.const_env = {}  # Variable name -> known int or float value
+
+    def run(self, instructions):
+        """Return the folded list of instructions."""
+        self.const_env = {}
+        return [self.fold_instruction(instruction) for instruction in instructions]
+
+    def fold_instruction(self, instruction):
+        """Fold a single instruction against the values known so far."""
+        op, args = instruction.op, instruction.args
+        const_env = self.const_env
 
-    def get_temp_variable(self):
-        """Generate a new temporary variable for optimizations."""
-        return f"t{len(self.optimized_instructions)}"
+        if op == 'label' or op == 'call':
+            const_env.clear()
+            return instruction
+
+        if op == '=':
+            value = self.value_of(args[1])
+            if value is None:
+                const_env.pop(args[0], None)
+                return instruction
+            const_env[args[0]] = value
+            return IRInstruction('=', (args[0], format_constant(value)))
+
+        if op in ARITHMETIC_OPERATIONS:
+            dest, lhs, rhs = args
+            left = self.value_of(lhs)
+            right = self.value_of(rhs)
+            if left is not None and right is not None:
+                result = _FOLD[op](left, right)
+                if result is not None:
+                    const_env[dest] = result
+                    return IRInstruction('=', (dest, format_constant(result)))
+            simplified = simplify_identity(op, lhs, rhs, left, right)
+            if simplified is not None:
+                return self.fold_instruction(IRInstruction('=', (dest, simplified)))
+            const_env.pop(dest, None)
+            return IRInstruction(op, (dest, self.substitute(lhs), self.substitute(rhs)))
+
+        if op in COMPARISON_OPERATORS:
+            dest, lhs, rhs = args
+            const_env.pop(dest, None)
+            return IRInstruction(op, (dest, self.substitute(lhs), self.substitute(rhs)))
+
+        if op == 'if':
+            lhs, operator, rhs, label = args
+            return IRInstruction('if', (self.substitute(lhs), operator, self.substitute(rhs), label))
+
+        if op == 'select':
+            result, operator, lhs, rhs, true_value, false_value = args
+            const_env.pop(result, None)
+            return IRInstruction('select', (result, operator, self.substitute(lhs), self.substitute(rhs),
+                                            self.substitute(true_value), self.substitute(false_value)))
+
+        if op == 'print' or op == 'return':
+            return IRInstruction(op, tuple(self.substitute(arg) for arg in args))
+
+        if op != 'goto' and op != 'param':
+            # Unknown operations may write anything
+            const_env.clear()
+        return instruction
+
+    def value_of(self, operand):
+        """Return the known numeric value of an operand, or None."""
+        value = parse_constant(operand)
+        if value is None:
+            value = self.const_env.get(operand)
+        return value
+
+    def substitute(self, operand):
+        """Replace a variable with its known value."""
+        value = self.const_env.get(operand)
+        return operand if value is None else format_constant(value)
 
 
 # Example Usage
@@ -112,6 +315,11 @@ if __name__ == '__main__':
     }
     int d = add(1, 2);
     print(d);
+    int t99 = 0;
+    while (t99 < 3) {
+        t99 = t99 + 1;
+    }
+    print(t99);
     '''
     from parser import parser
     from ir_generator import IRGenerator
@@ -121,8 +329,9 @@ if __name__ == '__main__':
     print("Original Instructions:")
     for instr in instructions:
         print(instr)
-    # Optimize the instructions
-    optimizer = IROptimizer()
+    # Fold constants first, then optimize the instructions
+    instructions = ConstFoldPass().run(instructions)
+    optimizer = IROptimizer(ir_generator.temps)
     optimized_instructions = optimizer.optimize(instructions)
     
     print("Optimized Instructions:")
@@ -1,3 +1,5 @@
+import sys
+
 import ply.yacc as yacc
 from lexer import tokens  # Assuming lexer.py defines the tokens
 
@@ -8,9 +10,11 @@ def add_variable_to_symbol_table(identifier, var_type):
         raise Exception(f"Variable '{identifier}' is already declared.")
     symbol_table[identifier] = var_type
 
-# AST node classes
+# AST node classes (slotted, so nodes carry no per-instance __dict__)
 
 class VariableDeclaration:
+    __slots__ = ('var_type', 'identifier', 'value')
+
     def __init__(self, var_type, identifier, value):
         self.var_type = var_type  # Type of the variable (e.g., int, float, string)
         self.identifier = identifier  # Variable being declared
@@ -20,6 +24,8 @@ class VariableDeclaration:
         return f"VariableDeclaration({self.var_type}, {self.identifier}, {self.value})"
 
 class AssignStatement:
+    __slots__ = ('identifier', 'value')
+
     def __init__(self, identifier, value):
         self.identifier = identifier  # Variable being assigned
         self.value = value  # Value being assigned
@@ -28,6 +34,8 @@ class AssignStatement:
         return f"AssignStatement({self.identifier}, {self.value})"
 
 class IfStatement:
+    __slots__ = ('condition', 'body', 'else_body')
+
     def __init__(self, condition, body, else_body=None):
         self.condition = condition  # The condition of the if statement
         self.body = body  # The body of the if statement (a list of statements)
@@ -37,6 +45,8 @@ class IfStatement:
         return f"IfStatement({self.condition}, {self.body}, {self.else_body})"
 
 class ReturnStatement:
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value  # The expression to be returned
 
@@ -44,18 +54,24 @@ class ReturnStatement:
         return f"ReturnStatement({self.value})"
 
 class PrintStatement:
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value  # The expression to be printed
 
     def __repr__(self):
         return f"PrintStatement({self.value})"
 class InputStatement:
+    __slots__ = ('value',)
+
     def __init__(self, value):
         self.value = value  # The expression to be input
 
     def __repr__(self):
         return f"InputStatement({self.value})"
 class FunctionDefinition:
+    __slots__ = ('name', 'parameters', 'body', 'return_type')
+
     def __init__(self, name, parameters, body, return_type):
         self.name = name  # The name of the function
         self.parameters = parameters  # A list of parameters
@@ -66,6 +82,8 @@ class FunctionDefinition:
         return f"FunctionDefinition({self.name}, {self.parameters}, {self.body}, {self.return_type})"
 
 class FunctionCall:
+    __slots__ = ('function_name', 'arguments')
+
     def __init__(self, function_name, arguments):
         self.function_name = function_name  # The function being called
         self.arguments = arguments  # List of arguments being passed to the function
@@ -74,6 +92,8 @@ class FunctionCall:
         return f"FunctionCall({self.function_name}, {self.arguments})"
 
 class WhileStatement:
+    __slots__ = ('condition', 'body')
+
     def __init__(self, condition, body):
         self.condition = condition  # The condition of the while loop
         self.body = body  # The body of the while loop (a list of statements)
@@ -81,7 +101,18 @@ class WhileStatement:
     def __repr__(self):
         return f"WhileStatement({self.condition}, {self.body})"
 
+class Identifier:
+    __slots__ = ('name',)
+
+    def __init__(self, name):
+        self.name = name  # Name of the variable being referenced
+
+    def __repr__(self):
+        return f"Identifier({self.name})"
+
 class Program:
+    __slots__ = ('statements',)
+
     def __init__(self, statements):
         self.statements = statements  # List of statements (e.g., assignments)
 
@@ -106,7 +137,8 @@ def p_program(p):
     if len(p) == 2:
         p[0] = Program([p[1]])
     else:
-        p[0] = Program(p[1].statements + [p[2]])
+        p[1].statements.append(p[2])  # Grow the program in place instead of copying it
+        p[0] = p[1]
 
 # Handle variable declaration (with a type) and assignment
 def p_statement_declaration(p):
@@ -168,9 +200,10 @@ def p_params(p):
     '''params : type IDENTIFIER
               | params COMMA type IDENTIFIER'''
     if len(p) == 3:
-        p[0] = [p[1], p[2]] # Single parameter
+        p[0] = [[p[1], p[2]]]  # Single parameter
     else:
-        p[0] = [p[1]] + [[p[3], p[4]]]  # Add a new parameter
+        p[1].append([p[3], p[4]])  # Add a new parameter
+        p[0] = p[1]
 
 # Function call
 def p_statement_function_call(p):
@@ -192,7 +225,8 @@ def p_args(p):
     if len(p) == 2:
         p[0] = [p[1]]
     else:
-        p[0] = p[1] + [p[3]]
+        p[1].append(p[3])
+        p[0] = p[1]
 
 # Logical expressions
 def p_expression_logical_or(p):
@@ -211,7 +245,7 @@ def p_expression_comparison(p):
                   | expression LESSEQUAL expression
                   | expression EQEQUAL expression
                   | expression NEQUAL expression'''
-    p[0] = (p[1], p[2], p[3])
+    p[0] = (p[1], sys.intern(p[2]), p[3])  # Interned, so operator compares are identity checks
 
 # Arithmetic expressions
 def p_expression_arithmetic(p):
@@ -219,11 +253,12 @@ def p_expression_arithmetic(p):
                   | expression MINUS expression
                   | expression TIMES expression
                   | expression DIVIDE expression'''
-    p[0] = (p[1], p[2], p[3])
+    p[0] = (p[1], sys.intern(p[2]), p[3])
 
 def p_expression_number(p):
     '''expression : NUMBER'''
-    p[0] = float(p[1])  # Convert number to float
+    value = p[1]
+    p[0] = float(value) if '.' in value else int(value)  # Keep integer literals as int
 
 def p_expression_string(p):
     '''expression : STRING'''
@@ -231,7 +266,7 @@ def p_expression_string(p):
 
 def p_expression_identifier(p):
     '''expression : IDENTIFIER'''
-    p[0] = p[1]
+    p[0] = Identifier(p[1])  # Keep variable references apart from string literals
 
 def p_expression_true(p):
     '''expression : TRUE'''
@@ -267,8 +302,10 @@ def p_error(p):
     else:
         print("Syntax error at EOF")
 
-# Build the parser
-parser = yacc.yacc()
+# Build the parser from the checked-in parsetab.py. optimize=1 trusts the tables
+# without re-deriving the grammar signature, so delete parsetab.py (and rerun)
+# whenever a grammar rule or the precedence table changes.
+parser = yacc.yacc(optimize=1, debug=False, write_tables=True, tabmodule='parsetab')
 
 # Test the parser with variable declaration (with type)
 if __name__ == '__main__':
@@ -1,16 +1,43 @@
-from parser import parser, Program, VariableDeclaration, AssignStatement, IfStatement, ReturnStatement, PrintStatement, InputStatement, FunctionDefinition, FunctionCall, WhileStatement
+from parser import parser, Program, VariableDeclaration, AssignStatement, IfStatement, ReturnStatement, PrintStatement, InputStatement, FunctionDefinition, FunctionCall, WhileStatement, Identifier
+
+def _build_type_table():
+    """Enumerate the result type of every valid (left, right, operator) combination."""
+    arithmetic = ('+', '-', '*', '/')
+    table = {}
+    for operator in arithmetic + ('<', '>', '<=', '>=', '==', '!=', '&&', '||'):
+        for operand_type in ('int', 'float', 'bool'):
+            # Same-typed operands keep their type for arithmetic
+            table[(operand_type, operand_type, operator)] = operand_type if operator in arithmetic else 'bool'
+        # Mixing int and float promotes to float
+        table[('int', 'float', operator)] = table[('float', 'int', operator)] = 'float' if operator in arithmetic else 'bool'
+    return table
+
 class SemanticAnalyzer:
+    _TYPE_TABLE = _build_type_table()  # (left, right, operator) -> result type
+
     def __init__(self):
         self.symbol_table = {}
-        self.symbol_value = {}
         self.functions = {}
+        # Map each node type straight to its handler so analyze() is a single lookup
+        self._handlers = {
+            Program: self._do_program,
+            VariableDeclaration: self._do_vardecl,
+            AssignStatement: self._do_assign,
+            IfStatement: self._do_if,
+            ReturnStatement: self._do_return,
+            PrintStatement: self._do_print,
+            InputStatement: self._do_input,
+            FunctionDefinition: self._do_function_definition,
+            FunctionCall: self._do_function_call,
+            WhileStatement: self._do_while,
+            tuple: self._do_expression,  # Binary expressions like ('x', '+', 'y')
+            Identifier: self._do_identifier,  # Variable reference
+        }
 
-    def add_variable(self, identifier, var_type,var_value=None):
+    def add_variable(self, identifier, var_type):
         if identifier in self.symbol_table:
             raise Exception(f"Variable '{identifier}' is already declared.")
         self.symbol_table[identifier] = var_type
-        if var_value:
-            self.symbol_value[identifier] = var_value
 
     def get_variable_type(self, identifier):
         if identifier not in self.symbol_table:
@@ -29,165 +56,139 @@ class SemanticAnalyzer:
 
     def check_type(self, left, right, operator):
         # Ensure both operands are of compatible types
-
-        if left == right and left in ('int', 'float', 'bool'):
-            if operator in ('+', '-', '*', '/'):
-                return left
-            else:
-                return 'bool'
-        elif left == 'int' and right == 'float':
-            if operator in ('+', '-', '*', '/'):
-                return 'float'
-            else:
-                return 'bool'
-        elif left == 'float' and right == 'int':
-            if operator in ('+', '-', '*', '/'):
-                return 'float'
-            else:
-                return 'bool'
-        
-        else:
+        result = self._TYPE_TABLE.get((left, right, operator))
+        if result is None:
             raise Exception(f"Type mismatch: cannot apply '{operator}' to '{left}' and '{right}'.")
+        return result
 
 
     def analyze(self, node,parent=None):
+        # Dispatch on the exact node type with a single dict lookup
+        handler = self._handlers.get(type(node))
+        if handler is not None:
+            return handler(node, parent)
 
-        if isinstance(node, Program):
-            for statement in node.statements:
-                self.analyze(statement)
-
-        elif isinstance(node, VariableDeclaration):
-            # Add variable to the symbol table
-            self.add_variable(node.identifier, node.var_type,node.value)
-
-            if node.value:
-                value_type = self.analyze(node.value,parent=parent)
-                if value_type != node.var_type:
-                    raise Exception(f"Type mismatch: '{node.identifier}' declared as {node.var_type} but assigned {value_type}.")
-            return node.var_type
-
-        elif isinstance(node, AssignStatement):
-            # Ensure the variable is declared
-            var_type = self.get_variable_type(node.identifier)
-            value_type = self.analyze(node.value)
-            if var_type != value_type:
-                raise Exception(f"Type mismatch: cannot assign {value_type} to variable '{node.identifier}' of type {var_type}.")
-            self.symbol_value[node.identifier] = node.value
-            return var_type
-
-        elif isinstance(node, IfStatement):
-            # Check condition type (should be a boolean)
-            condition_type = self.analyze(node.condition)
-            if condition_type != 'bool':
-                raise Exception(f"Type mismatch: condition in 'if' statement should be of type 'bool', got {condition_type}.")
-            # Check the body of the if statement
-            for stmt in node.body.statements:
-                self.analyze(stmt)
-            if node.else_body:
-                for stmt in node.else_body.statements:
-                    self.analyze(stmt)
-
-        elif isinstance(node, ReturnStatement):
-            # Ensure return type matches the function's return type
-            if self.check_is_global_variable(node.value):
-                return_type = self.get_variable_type(node.value)
-            else:
-                return_type = self.analyze(node.value)
-            if parent.return_type != return_type:
-                
-                raise Exception(f"Type mismatch: function '{parent.name}' expects return type {parent.return_type}, got {return_type}.")
-            return return_type
-
-        elif isinstance(node, PrintStatement):
-            # Ensure print argument is valid
-            self.analyze(node.value)
-
-        elif isinstance(node, InputStatement):
-            # Input can be any type
-            return self.analyze(node.value)
-
-        elif isinstance(node, FunctionDefinition):
-            # Add function to the function table
-            self.add_function(node.name, node.return_type, node.parameters)
-            has_return = False
-            # Analyze function body
-            for stmt in node.body.statements:
-                if isinstance(stmt, ReturnStatement):
-                    has_return = True
-                self.analyze(stmt, parent=node)
-            if not has_return:
-                raise Exception(f"Function '{node.name}' is missing a return statement.")
-
-        elif isinstance(node, FunctionCall):
-            # Ensure the function is defined
-            func_info = self.get_function(node.function_name)
-            if len(node.arguments) != len(func_info['parameters']):
-                raise Exception(f"Function '{node.function_name}' expects {len(func_info['parameters'])} arguments, got {len(node.arguments)}.")
-            for arg, param in zip(node.arguments, func_info['parameters']):
-                arg_type = self.analyze(arg)
-                if arg_type != param[0]:
-                    raise Exception(f"Argument type mismatch: expected {param}, got {arg_type} for '{arg}' in function '{node.function_name}'.")
-
-            return func_info['return_type']
-
-        elif isinstance(node, WhileStatement):
-            # Check condition type (should be a boolean)
-            condition = node.condition
-            new_condition = []
-            for con in condition:
-                if self.check_is_global_variable(con):
-                    new_condition.append(self.get_variable_value(con))
-                else:
-                    new_condition.append(con)
-            new_condition = tuple(new_condition)
-            condition_type = self.analyze(new_condition)
-            if condition_type != 'bool':
-                raise Exception(f"Type mismatch: condition in 'while' statement should be of type 'bool', got {condition_type}.")
-            for stmt in node.body.statements:
-                self.analyze(stmt)
-
-        elif isinstance(node, tuple):  # for expressions like ('x', '+', 'y')
-            left_type = self.analyze(node[0])
-            right_type = self.analyze(node[2])
-            left_value = node[0]
-            right_value = node[2]
-            is_function = parent and isinstance(parent, FunctionDefinition)
-            is_left_global = self.check_is_global_variable(left_value)
-            is_right_global = self.check_is_global_variable(right_value)
-            params = parent.parameters if is_function else None
-            
-            if is_function:
-                for i in range(len(params)):
-                    if params[i][1] == left_value:
-                        left_type = params[i][0]
-                    if params[i][1] == right_value:
-                        right_type = params[i][0]
-            if is_left_global:
-                left_type = self.get_variable_type(left_value)
-            if is_right_global:
-                right_type = self.get_variable_type(right_value)
-            return self.check_type(left_type, right_type, node[1])
-        
-
-        elif isinstance(node, (int, float, bool, str)):
-            #remove zero from float
-            if isinstance(node, float) and node.is_integer():
-                return 'int'
+        if isinstance(node, (int, float, bool, str)):
             # Literal values return their respective type
             return type(node).__name__
 
-        elif isinstance(node, str):  # Variable reference
-            return self.get_variable_type(node)
-
         else:
             raise Exception(f"Unknown node type: {type(node)}")
+
+    def _do_program(self, node, parent):
+        for statement in node.statements:
+            self.analyze(statement)
+
+    def _do_vardecl(self, node, parent):
+        # Add variable to the symbol table
+        self.add_variable(node.identifier, node.var_type)
+
+        if node.value:
+            value_type = self.analyze(node.value,parent=parent)
+            if value_type != node.var_type:
+                raise Exception(f"Type mismatch: '{node.identifier}' declared as {node.var_type} but assigned {value_type}.")
+        return node.var_type
+
+    def _do_assign(self, node, parent):
+        # Ensure the variable is declared
+        var_type = self.get_variable_type(node.identifier)
+        value_type = self.analyze(node.value, parent)
+        if var_type != value_type:
+            raise Exception(f"Type mismatch: cannot assign {value_type} to variable '{node.identifier}' of type {var_type}.")
+        return var_type
+
+    def _do_if(self, node, parent):
+        # Check condition type (should be a boolean)
+        condition_type = self.analyze(node.condition, parent)
+        if condition_type != 'bool':
+            raise Exception(f"Type mismatch: condition in 'if' statement should be of type 'bool', got {condition_type}.")
+        # Check the body of the if statement
+        for stmt in node.body.statements:
+            self.analyze(stmt, parent)
+        if node.else_body:
+            for stmt in node.else_body.statements:
+                self.analyze(stmt, parent)
+
+    def _do_return(self, node, parent):
+        # Ensure return type matches the function's return type
+        return_type = self.analyze(node.value, parent)
+        if parent.return_type != return_type:
+            
+            raise Exception(f"Type mismatch: function '{parent.name}' expects return type {parent.return_type}, got {return_type}.")
+        return return_type
+
+    def _do_print(self, node, parent):
+        # Ensure print argument is valid
+        self.analyze(node.value, parent)
+
+    def _do_input(self, node, parent):
+        # Input can be any type
+        return self.analyze(node.value, parent)
+
+    def _do_function_definition(self, node, parent):
+        # Add function to the function table
+        self.add_function(node.name, node.return_type, node.parameters)
+        has_return = False
+        # Analyze function body
+        for stmt in node.body.statements:
+            if isinstance(stmt, ReturnStatement):
+                has_return = True
+            self.analyze(stmt, parent=node)
+        if not has_return:
+            raise Exception(f"Function '{node.name}' is missing a return statement.")
+
+    def _do_function_call(self, node, parent):
+        # Ensure the function is defined
+        func_info = self.get_function(node.function_name)
+        if len(node.arguments) != len(func_info['parameters']):
+            raise Exception(f"Function '{node.function_name}' expects {len(func_info['parameters'])} arguments, got {len(node.arguments)}.")
+        for arg, param in zip(node.arguments, func_info['parameters']):
+            arg_type = self.analyze(arg, parent)
+            if arg_type != param[0]:
+                raise Exception(f"Argument type mismatch: expected {param}, got {arg_type} for '{arg}' in function '{node.function_name}'.")
+
+        return func_info['return_type']
+
+    def _do_while(self, node, parent):
+        # Check condition type (should be a boolean)
+        condition_type = self.analyze(node.condition, parent)
+        if condition_type != 'bool':
+            raise Exception(f"Type mismatch: condition in 'while' statement should be of type 'bool', got {condition_type}.")
+        for stmt in node.body.statements:
+            self.analyze(stmt, parent)
+
+    def _do_expression(self, node, parent):  # for expressions like ('x', '+', 'y')
+        # Walk nested expressions in post-order with an explicit stack, so long
+        # chains like a + b + c + ... do not recurse once per operator.
+        # Operands resolve their own types, including parameters of the enclosing function
+        types = []
+        stack = [(node, False)]
+        while stack:
+            current, operands_done = stack.pop()
+            if operands_done:
+                right_type = types.pop()
+                left_type = types.pop()
+                types.append(self.check_type(left_type, right_type, current[1]))
+            elif type(current) is tuple:
+                stack.append((current, True))
+                stack.append((current[2], False))
+                stack.append((current[0], False))  # Left operand is checked first
+            else:
+                types.append(self.analyze(current, parent))
+        return types[0]
+
+    def _do_identifier(self, node, parent):
+        # Globals take precedence over the parameters of the enclosing function
+        symbol_table = self.symbol_table
+        name = node.name
+        if name in symbol_table:
+            return symbol_table[name]
+        if isinstance(parent, FunctionDefinition):
+            for param in parent.parameters:
+                if param[1] == name:
+                    return param[0]
+        return self.get_variable_type(name)  # Raises for an undeclared variable
         
-    def check_is_global_variable(self,identifier):
-        if identifier in self.symbol_table:
-            return True
-        return False
-    def get_variable_value(self,identifier):
-        return self.symbol_value[identifier]
 
 # Example of running the semantic analysis
 if __name__ == '__main__':